@@ -1,5 +1,14 @@
 # app.py
 
+# 安装了 gevent 时用协程服务器运行：课程余量推送（SSE）的长连接只占一个协程而不是一个线程
+# monkey.patch_all() 必须在其他模块（threading、pymysql 的 socket）导入之前执行
+try:
+    from gevent import monkey
+    monkey.patch_all()
+    from gevent.pywsgi import WSGIServer
+except ImportError:
+    WSGIServer = None
+
 from flask import Flask
 from flask_cors import CORS
 import config  # 导入配置
@@ -28,4 +37,8 @@ def index():
     return "Teaching System Backend is Running!"
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    if WSGIServer is not None:
+        # 部署时同理：gunicorn -k gevent app:app
+        WSGIServer(('127.0.0.1', 5000), app).serve_forever()
+    else:
+        app.run(debug=True, port=5000)
\ No newline at end of file
@@ -11,8 +11,12 @@ class DBHelper:
         try:
             with conn.cursor() as cursor:
                 cursor.execute(sql, params)
+                rows = cursor.fetchall()
+                # DictCursor 已经返回字典，直接使用；普通游标才需要按列名组装
+                if rows and isinstance(rows[0], dict):
+                    return list(rows)
                 columns = [col[0] for col in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [dict(zip(columns, row)) for row in rows]
         finally:
             conn.close()
 
@@ -41,4 +45,21 @@ class DBHelper:
         finally:
             conn.close()
 
+    # 4. 调用带 OUT 参数的存储过程，按参数顺序返回调用后的全部参数值
+    # pymysql 把第 i 个参数放在 @_过程名_i 中，OUT 参数需要再 SELECT 一次才能取到
+    def call_procedure_out(self, proc_name, args=()):
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.callproc(proc_name, args)
+                while cursor.nextset():
+                    pass
+                names = [f"@_{proc_name}_{i}" for i in range(len(args))]
+                cursor.execute(f"SELECT {', '.join(names)}")
+                row = cursor.fetchone()
+                conn.commit()
+                return [row[name] for name in names] if isinstance(row, dict) else list(row)
+        finally:
+            conn.close()
+
 db = DBHelper()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from db_helper import db
+from seat_events import seat_broadcaster
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -59,6 +60,30 @@ def add_student():
     return jsonify({"code": 200, "msg": "学生添加成功"})
 
 # 4. 课程数据管理（类似学生CRUD，略）
+@admin_bp.route('/courses/<course_id>/capacity', methods=['PUT'])
+def update_course_capacity(course_id):
+    data = request.get_json(silent=True) or {}
+    capacity = data.get('capacity')
+    # bool 是 int 的子类，需要单独排除
+    if not isinstance(capacity, int) or isinstance(capacity, bool) or capacity <= 0:
+        return jsonify({"code": 400, "msg": "课程容量必须为正整数"})
+
+    course = db.fetch_all("SELECT capacity FROM course WHERE course_id = %s", (course_id,))
+    if not course:
+        return jsonify({"code": 404, "msg": "课程不存在"})
+
+    if capacity != course[0]['capacity']:
+        # 容量不低于已选人数的校验放在同一条 UPDATE 中，避免与并发选课之间出现竞态
+        sql = """
+        UPDATE course SET capacity = %s
+        WHERE course_id = %s
+        AND %s >= (SELECT COUNT(*) FROM enrollment WHERE course_id = %s)
+        """
+        rowcount = db.execute_update(sql, (capacity, course_id, capacity, course_id))
+        if rowcount == 0:
+            return jsonify({"code": 400, "msg": "课程容量不能小于已选人数"})
+        seat_broadcaster.notify(course_id)
+    return jsonify({"code": 200, "msg": "课程容量更新成功"})
 
 # 5. 生成选课情况报表
 @admin_bp.route('/reports/enrollment', methods=['GET'])
@@ -1,5 +1,6 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from db_helper import db
+from seat_events import seat_broadcaster
 
 student_bp = Blueprint('student', __name__)
 
@@ -16,11 +17,11 @@ def enroll_course():
     # ★★★ 核心修复：匹配存储过程参数（student_id, course_id）并处理返回结果 ★★★
     try:
         # 调用存储过程，第三个参数为OUT类型，接收返回结果
-        # 假设db.call_procedure返回格式为：(('Success',),) 或 (('Already Enrolled',),) 等
-        result = db.call_procedure('sp_student_enroll', (student_id, course_id, ''))
-        p_result = result[0][0]  # 提取OUT参数结果
+        # 存储过程只设置OUT参数、不SELECT，需通过 call_procedure_out 读取 @_sp_student_enroll_2
+        p_result = db.call_procedure_out('sp_student_enroll', (student_id, course_id, ''))[2]
 
         if p_result == 'Success':
+            seat_broadcaster.notify(course_id)
             return jsonify({"code": 200, "msg": "选课成功"})
         elif p_result == 'Already Enrolled':
             return jsonify({"code": 400, "msg": "已选过该课程，无法重复选课"})
@@ -47,6 +48,7 @@ def drop_course():
         rowcount = db.execute_update(sql, (student_id, course_id))
         if rowcount == 0:
             return jsonify({"code": 404, "msg": "未找到选课记录"})
+        seat_broadcaster.notify(course_id)
         return jsonify({"code": 200, "msg": "退课成功"})
     except Exception as e:
         # 捕获触发器抛出的"已录入成绩无法退课"异常
@@ -85,6 +87,18 @@ def get_available_courses():
     
     return jsonify({"code": 200, "data": courses})
 
+# 课程余量实时推送（SSE），替代轮询 available_courses
+# 可选参数 course_id=C001,C002 只订阅关心的课程
+@student_bp.route('/seat_events', methods=['GET'])
+def seat_events():
+    course_ids = [cid for arg in request.args.getlist('course_id')
+                  for cid in arg.split(',') if cid]
+    return Response(
+        seat_broadcaster.stream(course_ids),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 # 查看已选课
 @student_bp.route('/enrolled_courses', methods=['GET'])
 def get_enrolled_courses():
@@ -0,0 +1,217 @@
+# seat_events.py
+# 选课余量实时推送（Server-Sent Events）
+# 选课/退课/修改容量成功后调用 seat_broadcaster.notify(course_id)，
+# 在一个短窗口内合并同一批变化，只查询变动过的课程，再推送给关心这些课程的订阅者。
+#
+# 注意：
+# 1. 广播器是进程内对象，多 worker 部署时各进程互不相通，需要换成共享通道（如 Redis pub/sub）；
+#    进程外的修改（直接改库、其他进程）只能靠 max_age 定期整体重查来纠正。
+# 2. 每个 SSE 连接在服务器端一直挂起。用 app.py 的 gevent 服务器（或 gunicorn -k gevent）
+#    运行时每个连接只是一个协程；用线程服务器时每个连接各占一个线程。
+# 3. 订阅者按课程登记在 _waiters 中，一个批次只唤醒订阅了其中课程（或订阅全部课程）的连接。
+import json
+import threading
+import time
+from collections import deque
+
+from db_helper import db
+
+ALL_COURSES = None  # _waiters 中订阅全部课程的键
+
+
+def _format_event(event, seq, data):
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"id: {seq}\nevent: {event}\ndata: {payload}\n\n"
+
+
+class SeatBroadcaster:
+    def __init__(self, window=0.5, history=256, heartbeat=15, max_age=30, backoff=10):
+        self.window = window          # 合并窗口（秒）
+        self.heartbeat = heartbeat    # 心跳间隔（秒）：超过该时间没有写出任何内容就发送一次
+        self.max_age = max_age        # 缓存超过该时间（秒）整体重查一次数据库
+        self.backoff = backoff        # 整体查询失败后，该时间（秒）内不再查库
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()  # 保证整体加载与增量刷新按顺序写入缓存
+        self._seq = 0
+        self._batches = deque(maxlen=history)  # [(seq, {course_id: remaining})]
+        self._remaining = None  # 余量缓存，首个订阅者连接时才加载
+        self._loaded_at = 0.0   # 上次整体加载的时间，置 0 表示缓存已失效
+        self._retry_at = 0.0
+        self._dirty = set()
+        self._timer = None
+        self._waiters = {}      # {course_id 或 ALL_COURSES: set(threading.Event)}
+
+    # 1. 写入端：记录有变化的课程，窗口结束后统一刷新
+    def notify(self, *course_ids):
+        with self._lock:
+            self._dirty.update(course_ids)
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._timer = None
+        if not dirty:
+            return
+        with self._db_lock:
+            # 还没有订阅者时无需查库，等首次快照时再整体加载
+            if self._remaining is None:
+                return
+            try:
+                rows = self._query_remaining(dirty)
+            except Exception as e:
+                # 刷新失败：缓存作废，下一次快照或心跳时整体重查
+                print(f"Seat Events Error: {e}")
+                self._loaded_at = 0.0
+                return
+            self._publish(rows)
+
+    def _publish(self, rows):
+        # 调用方需持有 _db_lock
+        with self._lock:
+            changes = {
+                cid: remaining for cid, remaining in rows.items()
+                if self._remaining.get(cid) != remaining
+            }
+            if not changes:
+                return
+            self._remaining.update(changes)
+            self._seq += 1
+            self._batches.append((self._seq, changes))
+            woken = set(self._waiters.get(ALL_COURSES, ()))
+            for cid in changes:
+                woken.update(self._waiters.get(cid, ()))
+        for wake in woken:
+            wake.set()
+
+    def _query_remaining(self, course_ids=None):
+        sql = """
+        SELECT c.course_id, (c.capacity - COUNT(e.student_id)) as remaining
+        FROM course c
+        LEFT JOIN enrollment e ON c.course_id = e.course_id
+        """
+        params = None
+        if course_ids:
+            placeholders = ', '.join(['%s'] * len(course_ids))
+            sql += f" WHERE c.course_id IN ({placeholders})"
+            params = list(course_ids)
+        sql += " GROUP BY c.course_id, c.capacity"
+        return {row['course_id']: int(row['remaining']) for row in db.fetch_all(sql, params)}
+
+    # 2. 读取端：快照 + 增量
+    def refresh(self):
+        """缓存未加载或已过期时整体重查一次，差异作为增量推送给在线订阅者。
+
+        查询失败后 backoff 秒内不再查库；此时若还没有缓存则抛出异常。
+        """
+        now = time.monotonic()
+        with self._db_lock:
+            if self._remaining is not None and now - self._loaded_at < self.max_age:
+                return
+            if now < self._retry_at:
+                if self._remaining is None:
+                    raise RuntimeError("课程余量暂不可用")
+                return
+            try:
+                rows = self._query_remaining()
+            except Exception as e:
+                self._retry_at = now + self.backoff
+                if self._remaining is None:
+                    raise
+                print(f"Seat Events Error: {e}")
+                return
+            self._loaded_at = now
+            if self._remaining is None:
+                with self._lock:
+                    self._remaining = rows
+            else:
+                self._publish(rows)
+
+    def snapshot(self):
+        self.refresh()
+        with self._lock:
+            return self._seq, dict(self._remaining)
+
+    def _subscribe(self, keys, wake):
+        with self._lock:
+            for key in keys:
+                self._waiters.setdefault(key, set()).add(wake)
+
+    def _unsubscribe(self, keys, wake):
+        with self._lock:
+            for key in keys:
+                waiters = self._waiters.get(key)
+                if waiters is not None:
+                    waiters.discard(wake)
+                    if not waiters:
+                        del self._waiters[key]
+
+    def stream(self, course_ids=None):
+        """生成 SSE 文本流：先发送快照，之后只推送余量有变化的课程。
+
+        course_ids 为空表示订阅全部课程；断线重连时 EventSource 会重新请求，
+        因此每次连接都会先收到一份快照（超过 max_age 则先重查数据库）。
+        距上次写出超过 heartbeat 秒就发送心跳，以便及时发现已断开的连接。
+        """
+        wanted = set(course_ids) if course_ids else None
+        keys = wanted if wanted is not None else {ALL_COURSES}
+
+        def pick(data):
+            if wanted is None:
+                return data
+            return {cid: v for cid, v in data.items() if cid in wanted}
+
+        try:
+            seq, data = self.snapshot()
+        except Exception as e:
+            # 拿不到快照时让浏览器按 backoff 间隔重连，避免每 3 秒重连一次都去查库
+            print(f"Seat Events Error: {e}")
+            yield f"retry: {int(self.backoff * 1000)}\n: unavailable\n\n"
+            return
+
+        wake = threading.Event()
+        self._subscribe(keys, wake)
+        try:
+            yield f"retry: 3000\n{_format_event('snapshot', seq, pick(data))}"
+            last_write = time.monotonic()
+
+            while True:
+                wake.wait(max(0.0, self.heartbeat - (time.monotonic() - last_write)))
+                wake.clear()
+                with self._lock:
+                    if self._seq == seq:
+                        batches = None
+                    elif self._batches and self._batches[0][0] <= seq + 1:
+                        batches = [b for b in self._batches if b[0] > seq]
+                    else:
+                        batches = []  # 落后太多，历史已被淘汰，改发快照
+                        snap_seq, snap = self._seq, dict(self._remaining)
+
+                message = None
+                if batches == []:
+                    seq = snap_seq
+                    message = _format_event('snapshot', seq, pick(snap))
+                elif batches:
+                    merged = {}
+                    for _, changes in batches:
+                        merged.update(changes)
+                    seq = batches[-1][0]
+                    merged = pick(merged)
+                    if merged:
+                        message = _format_event('seats', seq, merged)
+
+                if message is None:
+                    if time.monotonic() - last_write < self.heartbeat:
+                        continue
+                    self.refresh()
+                    message = ": keep-alive\n\n"
+                last_write = time.monotonic()
+                yield message
+        finally:
+            self._unsubscribe(keys, wake)
+
+
+seat_broadcaster = SeatBroadcaster()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 后端代码以 application/backend 为工作目录运行（import db_helper 等），测试时同样加入路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'application', 'backend'))
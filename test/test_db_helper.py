@@ -0,0 +1,59 @@
+# db_helper 测试：用假连接代替 MySQL
+import db_helper
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def callproc(self, name, args):
+        self.executed.append(('callproc', name, args))
+
+    def nextset(self):
+        return None
+
+    def execute(self, sql, params=None):
+        self.executed.append(('execute', sql, params))
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_call_procedure_out_reads_out_param(monkeypatch):
+    cursor = FakeCursor([{'@_sp_student_enroll_0': 'S001', '@_sp_student_enroll_1': 'C001',
+                          '@_sp_student_enroll_2': 'Success'}])
+    monkeypatch.setattr(db_helper.db, 'get_connection', lambda: FakeConnection(cursor))
+    result = db_helper.db.call_procedure_out('sp_student_enroll', ('S001', 'C001', ''))
+    assert result == ['S001', 'C001', 'Success']
+    assert cursor.executed[-1][1] == \
+        "SELECT @_sp_student_enroll_0, @_sp_student_enroll_1, @_sp_student_enroll_2"
+
+
+def test_fetch_all_returns_dict_rows(monkeypatch):
+    cursor = FakeCursor([{'course_id': 'C001', 'remaining': 25}])
+    monkeypatch.setattr(db_helper.db, 'get_connection', lambda: FakeConnection(cursor))
+    assert db_helper.db.fetch_all("SELECT 1") == [{'course_id': 'C001', 'remaining': 25}]
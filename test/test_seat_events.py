@@ -0,0 +1,133 @@
+# 课程余量推送（seat_events）单元测试，数据库用 monkeypatch 替换
+import threading
+import time
+
+import pytest
+
+import seat_events
+from seat_events import SeatBroadcaster
+
+
+class FakeDB:
+    def __init__(self, remaining):
+        self.remaining = remaining
+        self.calls = 0
+        self.fail = False
+
+    def fetch_all(self, sql, params=None):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("db down")
+        ids = params or list(self.remaining)
+        return [{'course_id': cid, 'remaining': self.remaining[cid]}
+                for cid in ids if cid in self.remaining]
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = FakeDB({'C001': 25, 'C002': 18})
+    monkeypatch.setattr(seat_events.db, 'fetch_all', fake.fetch_all)
+    return fake
+
+
+def flush(broadcaster):
+    # 不等定时器，直接刷新
+    broadcaster._timer.cancel()
+    broadcaster._flush()
+
+
+def test_snapshot_then_filtered_updates(fake_db):
+    b = SeatBroadcaster(heartbeat=0.05)
+    stream = b.stream(['C001'])
+    assert next(stream) == 'retry: 3000\nid: 0\nevent: snapshot\ndata: {"C001": 25}\n\n'
+
+    fake_db.remaining['C002'] = 17
+    b.notify('C002')
+    flush(b)
+    assert next(stream) == ": keep-alive\n\n"  # 未订阅的课程不推送
+
+    fake_db.remaining['C001'] = 24
+    b.notify('C001')
+    flush(b)
+    assert next(stream) == 'id: 2\nevent: seats\ndata: {"C001": 24}\n\n'
+
+
+def test_notifications_are_coalesced(fake_db):
+    b = SeatBroadcaster()
+    b.snapshot()
+    calls = fake_db.calls
+    for _ in range(5):
+        fake_db.remaining['C001'] -= 1
+        b.notify('C001')
+    flush(b)
+    assert fake_db.calls == calls + 1
+    assert list(b._batches) == [(1, {'C001': 20})]
+
+
+def test_batch_wakes_only_affected_subscribers(fake_db):
+    b = SeatBroadcaster()
+    stream = b.stream(['C001'])
+    next(stream)
+    wake, = b._waiters['C001']
+    fake_db.remaining['C002'] = 17
+    b.notify('C002')
+    flush(b)
+    assert not wake.is_set()
+    fake_db.remaining['C001'] = 24
+    b.notify('C001')
+    flush(b)
+    assert wake.is_set()
+    stream.close()
+    assert b._waiters == {}
+
+
+def test_filtered_subscriber_keeps_alive_while_other_courses_change(fake_db):
+    b = SeatBroadcaster(heartbeat=0.1)
+    stream = b.stream(['C001'])
+    next(stream)
+    done = threading.Event()
+
+    def churn():
+        while not done.is_set():
+            fake_db.remaining['C002'] -= 1
+            b.notify('C002')
+            flush(b)
+            time.sleep(0.01)
+
+    worker = threading.Thread(target=churn)
+    worker.start()
+    try:
+        assert next(stream) == ": keep-alive\n\n"
+    finally:
+        done.set()
+        worker.join()
+
+
+def test_lagging_subscriber_gets_snapshot(fake_db):
+    b = SeatBroadcaster(history=2)
+    stream = b.stream()
+    next(stream)
+    for _ in range(3):
+        fake_db.remaining['C001'] -= 1
+        b.notify('C001')
+        flush(b)
+    assert next(stream) == 'id: 3\nevent: snapshot\ndata: {"C001": 22, "C002": 18}\n\n'
+
+
+def test_failed_flush_invalidates_cache(fake_db):
+    b = SeatBroadcaster()
+    b.snapshot()
+    fake_db.remaining['C001'] = 24
+    fake_db.fail = True
+    b.notify('C001')
+    flush(b)
+    fake_db.fail = False
+    assert b.snapshot()[1]['C001'] == 24
+
+
+def test_failed_snapshot_backs_off(fake_db):
+    fake_db.fail = True
+    b = SeatBroadcaster(backoff=10)
+    assert list(b.stream()) == ["retry: 10000\n: unavailable\n\n"]
+    assert list(b.stream()) == ["retry: 10000\n: unavailable\n\n"]
+    assert fake_db.calls == 1
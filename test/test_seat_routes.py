@@ -0,0 +1,103 @@
+# 课程余量相关接口测试：选课/退课通知、修改课程容量、SSE 订阅参数，数据库用 monkeypatch 替换
+import pytest
+from flask import Flask
+
+import routes.admin
+import routes.student
+from routes.admin import admin_bp
+from routes.student import student_bp
+
+
+@pytest.fixture
+def notified(monkeypatch):
+    calls = []
+    monkeypatch.setattr(routes.student.seat_broadcaster, 'notify', lambda *ids: calls.extend(ids))
+    return calls
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(student_bp, url_prefix='/api/student')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    return app.test_client()
+
+
+def test_enroll_reads_out_param_and_notifies(client, monkeypatch, notified):
+    monkeypatch.setattr(routes.student.db, 'call_procedure_out',
+                        lambda name, args: [args[0], args[1], 'Success'])
+    resp = client.post('/api/student/enroll', json={'student_id': 'S001', 'course_id': 'C001'})
+    assert resp.json['code'] == 200
+    assert notified == ['C001']
+
+
+def test_enroll_full_course_does_not_notify(client, monkeypatch, notified):
+    monkeypatch.setattr(routes.student.db, 'call_procedure_out',
+                        lambda name, args: [args[0], args[1], 'Course Full'])
+    resp = client.post('/api/student/enroll', json={'student_id': 'S001', 'course_id': 'C001'})
+    assert resp.json['code'] == 400
+    assert notified == []
+
+
+def test_seat_events_parses_course_ids(client, monkeypatch):
+    seen = []
+    monkeypatch.setattr(routes.student.seat_broadcaster, 'stream',
+                        lambda course_ids: seen.append(course_ids) or iter([': ok\n\n']))
+    resp = client.get('/api/student/seat_events?course_id=C001,C002&course_id=C003,')
+    assert resp.mimetype == 'text/event-stream'
+    assert resp.get_data(as_text=True) == ': ok\n\n'
+    assert seen == [['C001', 'C002', 'C003']]
+
+
+@pytest.fixture
+def course_db(monkeypatch, notified):
+    state = {'capacity': 30, 'enrolled': 5, 'updates': 0}
+
+    def fetch_all(sql, params=None):
+        return [{'capacity': state['capacity']}] if params[0] == 'C001' else []
+
+    def execute_update(sql, params=None):
+        capacity, _, _, _ = params
+        if capacity < state['enrolled']:
+            return 0
+        state['capacity'] = capacity
+        state['updates'] += 1
+        return 1
+
+    monkeypatch.setattr(routes.admin.db, 'fetch_all', fetch_all)
+    monkeypatch.setattr(routes.admin.db, 'execute_update', execute_update)
+    return state
+
+
+@pytest.mark.parametrize('body', [None, {}, {'capacity': True}, {'capacity': '40'},
+                                  {'capacity': 4.5}, {'capacity': 0}])
+def test_capacity_rejects_invalid_body(client, course_db, body):
+    if body is None:
+        resp = client.put('/api/admin/courses/C001/capacity', data='not json')
+    else:
+        resp = client.put('/api/admin/courses/C001/capacity', json=body)
+    assert resp.json['code'] == 400
+    assert course_db['updates'] == 0
+
+
+def test_capacity_unknown_course(client, course_db):
+    resp = client.put('/api/admin/courses/X/capacity', json={'capacity': 40})
+    assert resp.json['code'] == 404
+
+
+def test_capacity_unchanged_is_ok(client, course_db, notified):
+    resp = client.put('/api/admin/courses/C001/capacity', json={'capacity': 30})
+    assert resp.json['code'] == 200
+    assert course_db['updates'] == 0 and notified == []
+
+
+def test_capacity_below_enrollment(client, course_db, notified):
+    resp = client.put('/api/admin/courses/C001/capacity', json={'capacity': 3})
+    assert resp.json['code'] == 400
+    assert course_db['capacity'] == 30 and notified == []
+
+
+def test_capacity_update_notifies(client, course_db, notified):
+    resp = client.put('/api/admin/courses/C001/capacity', json={'capacity': 40})
+    assert resp.json['code'] == 200
+    assert course_db['capacity'] == 40 and notified == ['C001']